@@ -16,9 +16,21 @@ Version: 1.0
 import requests
 import json
 from lxml import etree
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+import math
+import re
 import os
 
+# orjson est optionnel : sérialisation JSON bien plus rapide que le module standard,
+# avec repli automatique sur json s'il n'est pas installé
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ============================================================================
 # CONFIGURATION GLOBALE
 # ============================================================================
@@ -26,9 +38,31 @@ import os
 # URL de l'API DATEX II de Bison Futé pour les événements routiers de la DIR Ouest
 DATEX_URL = 'https://tipi.bison-fute.gouv.fr/bison-fute-ouvert/publicationsDIR/Evenementiel-DIR/grt/RRN/content.xml'
 
+# Délais maximums (en secondes) d'établissement de la connexion et de lecture de la réponse
+HTTP_TIMEOUT = (5, 30)
+
+# Session HTTP partagée : la connexion (TCP + TLS) est conservée et réutilisée
+# entre les requêtes, et la réponse XML est demandée compressée
+SESSION = requests.Session()
+SESSION.headers.update({
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'signalement-inondation/1.0'
+})
+
 # Chemin du fichier de sortie GeoJSON contenant les inondations
 OUTPUT_FILE = 'data/inondations-diro.geojson'
 
+# Chemin du fichier GeoJSON Text Sequence (RFC 7464) : une feature par ligne,
+# écrite au fil du parsing, lisible directement par GDAL/QGIS ou jq --seq
+SEQUENCE_FILE = 'data/inondations-diro.geojsons'
+
+# GeoJSON compact par défaut (fichier plus léger, écriture plus rapide) ;
+# définir la variable d'environnement PRETTY pour une sortie indentée (débogage)
+PRETTY_OUTPUT = bool(os.environ.get('PRETTY'))
+
+# Longueur maximale de la description d'une feature (en caractères)
+DESCRIPTION_MAX_LENGTH = 300
+
 # Chemin du fichier de statistiques texte
 STATS_FILE = 'data/inondations-diro-stats.txt'
 
@@ -40,20 +74,151 @@ NS = {
     'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
 }
 
+# Noms qualifiés (notation {namespace}) pour la balise suivie en streaming
+# et la lecture directe de l'attribut xsi:type
+DATEX_NS = '{http://datex2.eu/schema/2/2_0}'
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+
+# Balise qualifiée des enregistrements d'événements, utilisée pour le parsing en streaming
+RECORD_TAG = f'{DATEX_NS}situationRecord'
+
+# Expressions XPath précompilées une seule fois au chargement du module :
+# aucune compilation ni résolution de namespaces n'est refaite pour chaque
+# enregistrement. Elles renvoient directement des chaînes lues par libxml2,
+# sans créer d'objets Element intermédiaires : string(...) vaut '' si l'élément
+# est absent, text() renvoie la liste des valeurs pour les éléments répétés.
+# smart_strings=False renvoie des chaînes simples, qui ne gardent pas de
+# référence vers l'arbre XML libéré.
+def _xpath(path):
+    return etree.XPath(path, namespaces=NS, smart_strings=False)
+
+XPATH_SEVERITY = _xpath('string(ns2:overallSeverity)')
+XPATH_SOURCE = _xpath('string(ns2:source/ns2:sourceIdentification)')
+XPATH_SUBTYPE = _xpath('string(ns2:environmentalObstructionType)')
+XPATH_START_TIME = _xpath('string(ns2:validity/ns2:validityTimeSpecification/ns2:overallStartTime)')
+XPATH_END_TIME = _xpath('string(ns2:validity/ns2:validityTimeSpecification/ns2:overallEndTime)')
+# Seule la première coordonnée est utilisée : le prédicat [1] arrête la
+# recherche dès le premier point trouvé au lieu de les collecter tous
+XPATH_LAT = _xpath('string((ns2:groupOfLocations//ns2:latitude)[1])')
+XPATH_LON = _xpath('string((ns2:groupOfLocations//ns2:longitude)[1])')
+XPATH_ROAD = _xpath('string((ns2:groupOfLocations//ns2:roadNumber)[1])')
+XPATH_COMMENTS = _xpath('ns2:generalPublicComment/ns2:comment/ns2:values/ns2:value[@lang="fr"]/text()')
+
+# Mots-clés d'inondation recherchés (insensible à la casse) dans les textes
+# d'un enregistrement dont le sous-type n'est pas renseigné
+FLOOD_KEYWORD_RE = re.compile(r'inond|crue|flood', re.IGNORECASE)
+
+
+# ============================================================================
+# FONCTIONS UTILITAIRES
+# ============================================================================
+
+def has_flood_keyword(record):
+    """
+    Indique si un enregistrement mentionne une inondation dans ses textes.
+    
+    Les nœuds texte sont parcourus un par un avec itertext(), sans sérialiser
+    l'enregistrement, et la recherche s'arrête au premier mot-clé trouvé.
+    
+    Args:
+        record (etree._Element): Élément situationRecord à inspecter
+        
+    Returns:
+        bool: True si un mot-clé d'inondation (inond, crue, flood) est présent
+    """
+    return any(FLOOD_KEYWORD_RE.search(text) for text in record.itertext())
+
+
+@lru_cache(maxsize=2048)
+def parse_iso_datetime(value):
+    """
+    Convertit une date ISO 8601 DATEX II en datetime avec fuseau horaire.
+    
+    Les dates du flux portent leur décalage UTC (ex: +02:00), conservé tel quel
+    pour comparer correctement les dates autour des changements d'heure.
+    Le suffixe 'Z' est converti pour les versions de Python < 3.11, et une date
+    sans fuseau est interprétée dans le fuseau horaire local.
+    
+    Les mêmes dates se répètent souvent d'un enregistrement à l'autre : les
+    résultats sont mis en cache (les datetime étant immuables, ils peuvent
+    être partagés sans risque).
+    
+    Args:
+        value (str): Date au format ISO 8601
+        
+    Returns:
+        datetime: Date avec fuseau horaire
+        
+    Raises:
+        ValueError: Si la date est mal formée
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.astimezone()
+
+
+def encode_feature(feature):
+    """
+    Encode une feature GeoJSON en enregistrement GeoJSON Text Sequence.
+    
+    Chaque enregistrement est préfixé par le séparateur RS (0x1E) et terminé
+    par un saut de ligne, conformément à la RFC 7464.
+    
+    Args:
+        feature (dict): Feature GeoJSON à encoder
+        
+    Returns:
+        bytes: Enregistrement encodé en UTF-8
+    """
+    if orjson is not None:
+        payload = orjson.dumps(feature)
+    else:
+        payload = json.dumps(feature, ensure_ascii=False).encode('utf-8')
+    
+    return b'\x1e' + payload + b'\n'
+
 
 # ============================================================================
 # FONCTIONS DE RÉCUPÉRATION DE DONNÉES
 # ============================================================================
 
+class CountingReader:
+    """
+    Enveloppe un flux binaire en comptant les octets lus.
+    
+    Permet de journaliser la taille du XML reçu alors qu'il est consommé
+    en streaming par le parser, sans jamais être chargé en entier en mémoire.
+    
+    Attributes:
+        raw: Flux binaire sous-jacent (doit fournir read() et close())
+        bytes_read (int): Nombre d'octets lus depuis le flux
+    """
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+    
+    def close(self):
+        self.raw.close()
+
+
 def fetch_xml():
     """
-    Récupère le flux XML DATEX II depuis l'API Bison Futé.
+    Ouvre le flux XML DATEX II depuis l'API Bison Futé.
     
-    Cette fonction effectue une requête HTTP GET vers l'API publique
-    et retourne le contenu XML brut.
+    Cette fonction effectue une requête HTTP GET en streaming vers l'API
+    publique via la session partagée SESSION : le corps de la réponse n'est
+    pas téléchargé d'un bloc mais lu au fur et à mesure par le parser.
     
     Returns:
-        bytes: Contenu XML brut de la réponse
+        CountingReader: Flux binaire du XML (décompressé), à fermer après lecture
         
     Raises:
         requests.exceptions.RequestException: En cas d'erreur de connexion ou HTTP
@@ -62,14 +227,17 @@ def fetch_xml():
     print(f"Récupération du XML depuis {DATEX_URL}")
     
     try:
-        # Requête HTTP avec timeout de 30 secondes pour éviter les blocages
-        response = requests.get(DATEX_URL, timeout=30)
+        # Requête HTTP en streaming avec timeouts de connexion et de lecture
+        response = SESSION.get(DATEX_URL, stream=True, timeout=HTTP_TIMEOUT)
         
         # Vérifie que la requête a réussi (code HTTP 2xx)
         response.raise_for_status()
         
-        print(f"XML récupéré avec succès ({len(response.content)} octets)")
-        return response.content
+        # Décompression gzip/deflate à la volée lors de la lecture du flux brut
+        response.raw.decode_content = True
+        
+        print("Connexion établie, lecture du XML en streaming")
+        return CountingReader(response.raw)
         
     except Exception as e:
         print(f"Erreur lors de la récupération du XML: {e}")
@@ -80,18 +248,24 @@ def fetch_xml():
 # FONCTIONS DE PARSING ET FILTRAGE
 # ============================================================================
 
-def parse_datex(xml_content):
+def parse_datex(xml_stream, seq_file=None):
     """
     Parse le XML DATEX II et extrait les inondations de la DIR Ouest.
     
+    Le flux est parcouru en streaming avec etree.iterparse : chaque
+    situationRecord est traité dès sa balise fermante, puis libéré,
+    ce qui évite de garder l'arbre XML complet en mémoire.
+    
     Cette fonction applique une série de filtres pour extraire uniquement
     les événements pertinents :
-    1. Filtre par source : DIR Ouest / DIRO uniquement
-    2. Filtre par type : EnvironmentalObstruction
+    1. Filtre par type : EnvironmentalObstruction
+    2. Filtre par source : DIR Ouest / DIRO uniquement
     3. Filtre par sous-type : flooding ou flashFloods
     
     Args:
-        xml_content (bytes): Contenu XML brut à parser
+        xml_stream (file): Flux binaire du XML à parser (objet fournissant read())
+        seq_file (file, optionnel): Fichier binaire ouvert dans lequel chaque
+            feature est écrite au format GeoJSON Text Sequence dès sa création
         
     Returns:
         tuple: (liste de features GeoJSON, dictionnaire de statistiques)
@@ -104,212 +278,246 @@ def parse_datex(xml_content):
     """
     print("Début du parsing XML...")
     
-    # Parse le contenu XML avec lxml
-    try:
-        root = etree.fromstring(xml_content)
-    except Exception as e:
-        print(f"Erreur lors du parsing XML: {e}")
-        raise
-    
-    # Récupération de toutes les situations (événements) dans le flux
-    situations = root.findall('.//ns2:situation', NS)
-    print(f"Nombre total de situations trouvées : {len(situations)}")
+    # Heure actuelle (avec fuseau horaire local) pour déterminer si un événement
+    # est encore actif : les dates DATEX II portent leur décalage UTC
+    now = datetime.now(timezone.utc).astimezone()
     
-    # Heure actuelle pour déterminer si un événement est encore actif
-    now = datetime.now()
+    # Horodatage de la mise à jour, commun à toutes les features du traitement
+    updated_at = datetime.now().isoformat()
     
     # Liste qui contiendra les features GeoJSON à exporter
     features = []
     
     # Initialisation du dictionnaire de statistiques pour le reporting
     stats = {
-        'total_situations': len(situations),        # Nombre total d'événements dans le flux
-        'dir_ouest': 0,                              # Événements de la DIR Ouest
-        'environmental_obstruction': 0,              # Type EnvironmentalObstruction
+        'total_situations': 0,                       # Nombre total d'événements dans le flux
+        'environmental_obstruction': 0,              # Type EnvironmentalObstruction (toutes sources)
+        'dir_ouest': 0,                              # Dont événements de la DIR Ouest
         'inondations': 0,                            # Inondations trouvées après tous les filtres
         'actives': 0,                                # Inondations encore en cours
         'terminees': 0,                              # Inondations terminées
-        'par_severite': {},                          # Répartition par niveau de sévérité
-        'par_subtype': {},                           # Répartition par sous-type (flooding/flashFloods)
+        'par_severite': Counter(),                   # Répartition par niveau de sévérité
+        'par_subtype': Counter(),                    # Répartition par sous-type (flooding/flashFloods)
         'sans_coords': 0                             # Événements sans coordonnées GPS
     }
     
-    # Parcours de chaque situation dans le flux XML
-    for situation in situations:
-        # Récupération de l'identifiant unique de la situation
-        sit_id = situation.get('id')
-        
-        # Récupération du niveau de sévérité global de la situation
-        # Valeur par défaut : 'medium' si non spécifié
-        severity_elem = situation.find('.//ns2:overallSeverity', NS)
-        severity = severity_elem.text if severity_elem is not None else 'medium'
-        
-        # Une situation peut contenir plusieurs enregistrements (situationRecord)
-        for record in situation.findall('.//ns2:situationRecord', NS):
-            
-            # ----------------------------------------------------------------
-            # FILTRE 1 : Vérification de la source (DIR Ouest uniquement)
-            # ----------------------------------------------------------------
-            # On ne garde que les événements provenant de la DIR Ouest
-            source_elem = record.find('.//ns2:sourceIdentification', NS)
-            if source_elem is None:
-                continue
-            
-            source = source_elem.text
-            
-            # Filtrage sur les identifiants DIR Ouest / DIRO
-            if 'DIR Ouest' not in source and 'DIRO' not in source:
-                continue
-            
-            stats['dir_ouest'] += 1
-            
-            # ----------------------------------------------------------------
-            # FILTRE 2 : Type d'événement = EnvironmentalObstruction
-            # ----------------------------------------------------------------
-            # Le type d'enregistrement est stocké dans un attribut xsi:type
-            record_type_raw = record.get('{http://www.w3.org/2001/XMLSchema-instance}type', '')
-            record_type = record_type_raw.replace('ns2:', '')
-            
-            # On ne garde que les obstructions environnementales
-            if 'EnvironmentalObstruction' not in record_type_raw:
-                continue
-            
-            stats['environmental_obstruction'] += 1
-            
-            # ----------------------------------------------------------------
-            # FILTRE 3 : Sous-type = flooding ou flashFloods
-            # ----------------------------------------------------------------
-            # Le sous-type précise la nature de l'obstruction
-            env_type_elem = record.find('.//ns2:environmentalObstructionType', NS)
-            env_subtype = None
-            
-            if env_type_elem is not None:
-                env_subtype = env_type_elem.text
+    # Sévérité globale de chaque situation, indexée par identifiant de situation.
+    # overallSeverity est un enfant de la situation qui précède ses situationRecord :
+    # on le lit au premier enregistrement rencontré, avant que le nettoyage
+    # du streaming ne supprime les éléments déjà traités.
+    severities = {}
+    
+    # Parcours en streaming de chaque enregistrement (situationRecord) du flux XML
+    records = etree.iterparse(xml_stream, events=('end',), tag=RECORD_TAG)
+    
+    try:
+        for _, record in records:
+            try:
+                # La situation parente porte l'identifiant et la sévérité globale
+                situation = record.getparent()
+                sit_id = situation.get('id')
                 
-                # On ne garde que les inondations (flooding) ou crues soudaines (flashFloods)
-                if env_subtype not in ['flooding', 'flashFloods']:
+                # Récupération du niveau de sévérité global de la situation
+                # Valeur par défaut : 'medium' si non spécifié
+                if sit_id not in severities:
+                    severities[sit_id] = XPATH_SEVERITY(situation) or 'medium'
+                    stats['total_situations'] += 1
+                severity = severities[sit_id]
+                
+                # ----------------------------------------------------------------
+                # FILTRE 1 : Type d'événement = EnvironmentalObstruction
+                # ----------------------------------------------------------------
+                # Le type d'enregistrement est stocké dans un attribut xsi:type.
+                # Simple lecture d'attribut : c'est le filtre le moins coûteux,
+                # il est donc appliqué en premier pour écarter au plus vite
+                # la grande majorité des enregistrements.
+                record_type_raw = record.get(XSI_TYPE, '')
+                
+                # On ne garde que les obstructions environnementales
+                if 'EnvironmentalObstruction' not in record_type_raw:
                     continue
-            else:
-                # Fallback : si le sous-type n'est pas explicitement défini,
-                # on cherche des mots-clés d'inondation dans le contenu XML
-                record_text = etree.tostring(record, encoding='unicode').lower()
-                if not any(kw in record_text for kw in ['inond', 'crue', 'flood']):
+                
+                record_type = record_type_raw.replace('ns2:', '')
+                stats['environmental_obstruction'] += 1
+                
+                # ----------------------------------------------------------------
+                # FILTRE 2 : Vérification de la source (DIR Ouest uniquement)
+                # ----------------------------------------------------------------
+                # On ne garde que les événements provenant de la DIR Ouest
+                source = XPATH_SOURCE(record)
+                if not source:
                     continue
                 
-                # Marquage spécial pour indiquer une détection par mots-clés
-                env_subtype = 'flooding-detected-by-keywords'
-            
-            # Si on arrive ici, l'événement est une inondation
-            stats['inondations'] += 1
-            stats['par_subtype'][env_subtype] = stats['par_subtype'].get(env_subtype, 0) + 1
-            
-            # ----------------------------------------------------------------
-            # EXTRACTION DES DATES ET CALCUL DU STATUT
-            # ----------------------------------------------------------------
-            
-            # Date de début de l'événement (obligatoire)
-            start_elem = record.find('.//ns2:overallStartTime', NS)
-            if start_elem is None:
-                continue  # Pas de date de début = événement invalide
-            
-            # Conversion de la date ISO en objet datetime
-            # Suppression des fuseaux horaires pour simplifier les comparaisons
-            try:
-                start_date = datetime.fromisoformat(start_elem.text.replace('+02:00', '').replace('+01:00', ''))
-            except:
-                continue  # Date mal formée = événement ignoré
-            
-            # Date de fin de l'événement (optionnelle)
-            end_elem = record.find('.//ns2:overallEndTime', NS)
-            is_active = True  # Par défaut, l'événement est considéré en cours
-            end_date_iso = None
-            
-            if end_elem is not None:
-                end_date_iso = end_elem.text
+                # Filtrage sur les identifiants DIR Ouest / DIRO
+                if 'DIR Ouest' not in source and 'DIRO' not in source:
+                    continue
+                
+                stats['dir_ouest'] += 1
+                
+                # ----------------------------------------------------------------
+                # FILTRE 3 : Sous-type = flooding ou flashFloods
+                # ----------------------------------------------------------------
+                # Le sous-type précise la nature de l'obstruction
+                env_subtype = XPATH_SUBTYPE(record)
+                
+                if env_subtype:
+                    # On ne garde que les inondations (flooding) ou crues soudaines (flashFloods)
+                    if env_subtype not in ['flooding', 'flashFloods']:
+                        continue
+                else:
+                    # Fallback : si le sous-type n'est pas explicitement défini,
+                    # on cherche des mots-clés d'inondation dans les textes de l'enregistrement
+                    if not has_flood_keyword(record):
+                        continue
+                    
+                    # Marquage spécial pour indiquer une détection par mots-clés
+                    env_subtype = 'flooding-detected-by-keywords'
+                
+                # Si on arrive ici, l'événement est une inondation
+                stats['inondations'] += 1
+                stats['par_subtype'][env_subtype] += 1
+                
+                # ----------------------------------------------------------------
+                # EXTRACTION DES DATES ET CALCUL DU STATUT
+                # ----------------------------------------------------------------
+                
+                # Date de début de l'événement (obligatoire)
+                start_date_iso = XPATH_START_TIME(record)
+                if not start_date_iso:
+                    continue  # Pas de date de début = événement invalide
+                
+                # Conversion de la date ISO en objet datetime (avec fuseau horaire)
                 try:
-                    end_date = datetime.fromisoformat(end_elem.text.replace('+02:00', '').replace('+01:00', ''))
-                    # L'événement est actif si la date de fin n'est pas encore passée
-                    is_active = now <= end_date
-                except:
-                    pass  # Si la date de fin est mal formée, on reste sur is_active=True
-            
-            # Mise à jour des compteurs d'événements actifs/terminés
-            if is_active:
-                stats['actives'] += 1
-            else:
-                stats['terminees'] += 1
-            
-            # ----------------------------------------------------------------
-            # EXTRACTION DES COORDONNÉES GPS
-            # ----------------------------------------------------------------
-            # Les coordonnées sont essentielles pour le format GeoJSON
-            
-            lat_elems = record.findall('.//ns2:latitude', NS)
-            lon_elems = record.findall('.//ns2:longitude', NS)
-            
-            # Vérification de la présence des coordonnées
-            if not lat_elems or not lon_elems:
-                stats['sans_coords'] += 1
-                continue  # Pas de coordonnées = événement non localisable, on l'ignore
-            
-            # Conversion des coordonnées en float
-            try:
-                lat = float(lat_elems[0].text)
-                lon = float(lon_elems[0].text)
-            except (ValueError, AttributeError):
-                stats['sans_coords'] += 1
-                continue  # Coordonnées invalides
-            
-            # ----------------------------------------------------------------
-            # EXTRACTION DES INFORMATIONS COMPLÉMENTAIRES
-            # ----------------------------------------------------------------
-            
-            # Numéro de route concernée (ex: N165, D123, etc.)
-            road_elem = record.find('.//ns2:roadNumber', NS)
-            road = road_elem.text if road_elem is not None else 'N/A'
-            
-            # Extraction de toutes les descriptions/commentaires en français
-            comments = []
-            for comment_elem in record.findall('.//ns2:generalPublicComment/ns2:comment/ns2:values/ns2:value[@lang="fr"]', NS):
-                if comment_elem.text:
-                    comments.append(comment_elem.text)
-            
-            # Concaténation des commentaires avec un séparateur
-            description = ' | '.join(comments) if comments else 'Pas de description'
-            
-            # Mise à jour des statistiques de sévérité
-            stats['par_severite'][severity] = stats['par_severite'].get(severity, 0) + 1
-            
-            # ----------------------------------------------------------------
-            # CRÉATION DE LA FEATURE GEOJSON
-            # ----------------------------------------------------------------
-            # Structure conforme à la spécification GeoJSON (RFC 7946)
-            
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [lon, lat]  # Format GeoJSON : [longitude, latitude]
-                },
-                "properties": {
-                    "id": sit_id,                          # Identifiant unique
-                    "source": source,                       # Source de données (DIR Ouest/DIRO)
-                    "road": road,                           # Route concernée
-                    "type": record_type,                    # Type d'événement
-                    "subtype": env_subtype,                 # Sous-type (flooding/flashFloods)
-                    "problem": "Inondation",                # Nature du problème
-                    "severity": severity,                   # Niveau de sévérité
-                    "description": description[:300],       # Description limitée à 300 caractères
-                    "start_date": start_elem.text,          # Date de début (format ISO)
-                    "end_date": end_date_iso,               # Date de fin (peut être None)
-                    "is_active": is_active,                 # Boolean : événement actif ?
-                    "status": "en_cours" if is_active else "terminee",  # Statut lisible
-                    "updated_at": datetime.now().isoformat()  # Horodatage de la mise à jour
+                    start_date = parse_iso_datetime(start_date_iso)
+                except ValueError:
+                    continue  # Date mal formée = événement ignoré
+                
+                # Date de fin de l'événement (optionnelle)
+                end_date_iso = XPATH_END_TIME(record) or None  # None si absente
+                is_active = True  # Par défaut, l'événement est considéré en cours
+                
+                # La date n'est convertie que si elle est présente : seul l'appel
+                # à fromisoformat reste protégé par le try
+                if end_date_iso:
+                    try:
+                        end_date = parse_iso_datetime(end_date_iso)
+                    except ValueError:
+                        pass  # Si la date de fin est mal formée, on reste sur is_active=True
+                    else:
+                        # L'événement est actif si la date de fin n'est pas encore passée
+                        is_active = now <= end_date
+                
+                # Mise à jour des compteurs d'événements actifs/terminés
+                if is_active:
+                    stats['actives'] += 1
+                else:
+                    stats['terminees'] += 1
+                
+                # ----------------------------------------------------------------
+                # EXTRACTION DES COORDONNÉES GPS
+                # ----------------------------------------------------------------
+                # Les coordonnées sont essentielles pour le format GeoJSON.
+                # Leur emplacement dépend du type de localisation (point, linéaire...),
+                # d'où la recherche en profondeur dans groupOfLocations.
+                
+                lat_text = XPATH_LAT(record)
+                lon_text = XPATH_LON(record)
+                
+                # Vérification de la présence des coordonnées
+                if not lat_text or not lon_text:
+                    stats['sans_coords'] += 1
+                    continue  # Pas de coordonnées = événement non localisable, on l'ignore
+                
+                # Conversion des coordonnées en float
+                try:
+                    lat = float(lat_text)
+                    lon = float(lon_text)
+                except ValueError:
+                    stats['sans_coords'] += 1
+                    continue  # Coordonnées invalides
+                
+                # float() accepte 'nan' et 'inf', qui produiraient un GeoJSON invalide
+                if not (math.isfinite(lat) and math.isfinite(lon)):
+                    stats['sans_coords'] += 1
+                    continue
+                
+                # ----------------------------------------------------------------
+                # EXTRACTION DES INFORMATIONS COMPLÉMENTAIRES
+                # ----------------------------------------------------------------
+                
+                # Numéro de route concernée (ex: N165, D123, etc.)
+                road = XPATH_ROAD(record) or 'N/A'
+                
+                # Extraction des descriptions/commentaires en français, en s'arrêtant
+                # dès que la description atteint sa longueur maximale
+                comments = []
+                length = 0
+                for comment in XPATH_COMMENTS(record):
+                    # Longueur du commentaire, précédé du séparateur ' | ' sauf le premier
+                    length += len(comment) + (3 if comments else 0)
+                    comments.append(comment)
+                    if length >= DESCRIPTION_MAX_LENGTH:
+                        break
+                
+                # Concaténation des commentaires avec un séparateur, limitée à la longueur maximale
+                if comments:
+                    description = ' | '.join(comments)[:DESCRIPTION_MAX_LENGTH]
+                else:
+                    description = 'Pas de description'
+                
+                # Mise à jour des statistiques de sévérité
+                stats['par_severite'][severity] += 1
+                
+                # ----------------------------------------------------------------
+                # CRÉATION DE LA FEATURE GEOJSON
+                # ----------------------------------------------------------------
+                # Structure conforme à la spécification GeoJSON (RFC 7946)
+                
+                feature = {
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "Point",
+                        "coordinates": [lon, lat]  # Format GeoJSON : [longitude, latitude]
+                    },
+                    "properties": {
+                        "id": sit_id,                          # Identifiant unique
+                        "source": source,                       # Source de données (DIR Ouest/DIRO)
+                        "road": road,                           # Route concernée
+                        "type": record_type,                    # Type d'événement
+                        "subtype": env_subtype,                 # Sous-type (flooding/flashFloods)
+                        "problem": "Inondation",                # Nature du problème
+                        "severity": severity,                   # Niveau de sévérité
+                        "description": description,             # Description limitée à 300 caractères
+                        "start_date": start_date_iso,           # Date de début (format ISO)
+                        "end_date": end_date_iso,               # Date de fin (peut être None)
+                        "is_active": is_active,                 # Boolean : événement actif ?
+                        "status": "en_cours" if is_active else "terminee",  # Statut lisible
+                        "updated_at": updated_at                # Horodatage de la mise à jour
+                    }
                 }
-            }
+                
+                # Ajout de la feature à la liste
+                features.append(feature)
+                
+                # Écriture immédiate de la feature dans le fichier séquentiel
+                if seq_file is not None:
+                    seq_file.write(encode_feature(feature))
             
-            # Ajout de la feature à la liste
-            features.append(feature)
+            finally:
+                # Libération de la mémoire : on vide l'enregistrement traité
+                # et on supprime les éléments déjà parcourus (enregistrements
+                # précédents de la situation, puis situations précédentes)
+                record.clear()
+                while record.getprevious() is not None:
+                    del situation[0]
+                while situation.getprevious() is not None:
+                    del situation.getparent()[0]
+    
+    except etree.XMLSyntaxError as e:
+        print(f"Erreur lors du parsing XML: {e}")
+        raise
+    
+    print(f"Nombre total de situations trouvées : {stats['total_situations']}")
     
     # Affichage du résumé du parsing
     print(f"Extraction terminée : {stats['inondations']} inondations DIR Ouest "
@@ -342,18 +550,25 @@ def create_geojson(features, stats):
         - Écrit les fichiers OUTPUT_FILE et STATS_FILE
     """
     
+    # Date de génération, commune au GeoJSON et au rapport de statistiques
+    generated_at = datetime.now()
+    
     # Construction de la structure GeoJSON complète
     # Conforme à la spécification RFC 7946
     geojson = {
         "type": "FeatureCollection",
         "metadata": {
-            "generated_at": datetime.now().isoformat(),  # Date de génération
+            "generated_at": generated_at.isoformat(),    # Date de génération
             "source": "DATEX II - Bison Futé",            # Source des données
             "filter": "Inondations DIR Ouest (Bretagne / Pays de la Loire)",  # Filtre appliqué
             "count": len(features),                       # Nombre total d'inondations
             "count_active": stats['actives'],             # Nombre d'inondations actives
             "count_finished": stats['terminees'],         # Nombre d'inondations terminées
-            "statistics": stats                           # Statistiques complètes
+            "statistics": {                               # Statistiques complètes
+                **stats,
+                'par_severite': dict(stats['par_severite']),
+                'par_subtype': dict(stats['par_subtype'])
+            }
         },
         "features": features  # Liste des features GeoJSON
     }
@@ -364,9 +579,17 @@ def create_geojson(features, stats):
     # ----------------------------------------------------------------
     # EXPORT DU GEOJSON
     # ----------------------------------------------------------------
-    # Sauvegarde avec indentation pour lisibilité et UTF-8 pour les accents
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(geojson, f, indent=2, ensure_ascii=False)
+    # Sauvegarde compacte (indentée si PRETTY_OUTPUT) et UTF-8 pour les accents
+    if orjson is not None:
+        # orjson produit directement des octets UTF-8, écrits sans conversion
+        option = orjson.OPT_INDENT_2 if PRETTY_OUTPUT else 0
+        with open(OUTPUT_FILE, 'wb') as f:
+            f.write(orjson.dumps(geojson, option=option))
+    else:
+        indent = 2 if PRETTY_OUTPUT else None
+        separators = None if PRETTY_OUTPUT else (',', ':')
+        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(geojson, f, indent=indent, separators=separators, ensure_ascii=False)
     
     print(f"Fichier GeoJSON sauvegardé : {OUTPUT_FILE}")
     
@@ -380,14 +603,14 @@ def create_geojson(features, stats):
         f.write(f"=" * 50 + "\n\n")
         
         # Informations générales
-        f.write(f"Généré le : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Généré le : {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Zone géographique : DIR Ouest (Bretagne / Pays de la Loire)\n")
         f.write(f"Filtres appliqués : EnvironmentalObstruction + flooding/flashFloods\n\n")
         
         # Statistiques de filtrage
         f.write(f"Situations totales dans le flux : {stats['total_situations']}\n")
-        f.write(f"Situations DIR Ouest : {stats['dir_ouest']}\n")
         f.write(f"Type EnvironmentalObstruction : {stats['environmental_obstruction']}\n")
+        f.write(f"  |-- dont DIR Ouest : {stats['dir_ouest']}\n")
         f.write(f"INONDATIONS IDENTIFIÉES : {stats['inondations']}\n")
         f.write(f"  |-- En cours : {stats['actives']}\n")
         f.write(f"  |-- Terminées : {stats['terminees']}\n")
@@ -417,8 +640,9 @@ def main():
     Point d'entrée principal du script.
     
     Cette fonction orchestre l'ensemble du processus :
-    1. Récupération du flux XML DATEX II
-    2. Parsing et filtrage des inondations DIR Ouest
+    1. Ouverture du flux XML DATEX II
+    2. Parsing en streaming et filtrage des inondations DIR Ouest, avec écriture au fil
+       de l'eau du fichier GeoJSON Text Sequence
     3. Export au format GeoJSON et génération des statistiques
     
     En cas d'erreur, affiche un message et propage l'exception.
@@ -428,11 +652,24 @@ def main():
     print("=" * 60)
     
     try:
-        # Étape 1 : Récupération du flux XML depuis l'API
-        xml_content = fetch_xml()
+        # Étape 1 : Ouverture du flux XML depuis l'API, lancée en arrière-plan
+        # pendant la préparation du répertoire de sortie (le GIL est relâché
+        # pendant l'attente réseau)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch_xml)
+            os.makedirs('data', exist_ok=True)
+            xml_stream = future.result()
+        
+        # Étape 2 : Parsing du XML au fil du téléchargement et application des filtres
+        # Les features sont écrites dans le fichier séquentiel au fil du parsing
+        try:
+            with open(SEQUENCE_FILE, 'wb') as seq_file:
+                features, stats = parse_datex(xml_stream, seq_file)
+        finally:
+            xml_stream.close()
         
-        # Étape 2 : Parsing du XML et application des filtres
-        features, stats = parse_datex(xml_content)
+        print(f"XML récupéré avec succès ({xml_stream.bytes_read} octets)")
+        print(f"Fichier GeoJSON Text Sequence sauvegardé : {SEQUENCE_FILE}")
         
         # Étape 3 : Export des résultats
         create_geojson(features, stats)